@@ -4,6 +4,11 @@ Programme principal de la recherche d'une (PLSC) plus longue sous-séquence
 commune entre deux chaînes
 Eric Buonocore. Le 21/06/2021
 
+Lancement:
+    python QPlsc.py                                   Fenêtre graphique
+    python QPlsc.py --sans-interface seq1 seq2        Résultat dans la console
+                                                      (Qt n'est pas importé)
+
 Vérifier les exportations
 Si rien n 'est coché, on ne dessine que les axes
 Parcours cyclique des PLSC
@@ -11,15 +16,42 @@ Ne pas afficher PLSC si rien n'est coché
 Export Image => que la dernière image
 """
 
-from qtpy.QtWidgets import (QApplication, QFrame)
-from QPlscFenetres import *
-from QPlscStructures import *
+import argparse
+import sys
+
+
+def lance_fenetre() -> int:
+    """ Lance l'application graphique. Renvoie son code de sortie
+    """
+    # Qt n'est importé que pour l'interface graphique
+    from qtpy.QtWidgets import QApplication
+    from QPlscFenetres import Fenetre
+    app = QApplication(sys.argv)
+    # Création de la fenêtre princiale de type Fenetre
+    frame = Fenetre()
+    # Affichhe le composant principale de frame
+    frame.widgetP.show()
+    return app.exec_()
+
+
+def lance_sans_interface(sequence1: str, sequence2: str) -> int:
+    """ Affiche la longueur et une PLSC de sequence1 et sequence2
+    """
+    from QPlscStructures import ResoPLSC
+    T = ResoPLSC()
+    longueur = T.calcule_tableau(sequence1, sequence2)
+    print(longueur)
+    print(T.chaîne_du_chemin(T.chemin_numéro(0)))
+    return 0
+
 
 # ********** Corps du programme **********
-# Lance l'application
-app=QApplication(sys.argv)
-# Création de la fenêtre princiale de type Fenetre
-frame = Fenetre()
-# Affichhe le composant principale de frame
-frame.widgetP.show()
-sys.exit(app.exec_())
+if __name__ == '__main__':
+    analyseur = argparse.ArgumentParser(description="Recherche d'une PLSC")
+    analyseur.add_argument('--sans-interface', nargs=2, metavar=('SEQ1', 'SEQ2'),
+                           help="Affiche le résultat dans la console, sans Qt")
+    # Les autres arguments sont laissés à QApplication
+    args, _ = analyseur.parse_known_args()
+    if args.sans_interface is not None:
+        sys.exit(lance_sans_interface(*args.sans_interface))
+    sys.exit(lance_fenetre())
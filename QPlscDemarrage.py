@@ -0,0 +1,103 @@
+# coding: utf-8
+"""
+Mesure du démarrage à froid (un nouvel interpréteur Python par mesure):
+ - sans interface: lancement jusqu'au premier résultat, sans importer Qt ni PIL
+ - fenêtre: lancement jusqu'à l'affichage de la première fenêtre, sans PIL
+Renvoie le code 1 si une médiane dépasse son budget ou si un module
+importé à tort est détecté.
+
+Lancement: python QPlscDemarrage.py [--repetitions 5]
+"""
+
+# ********** Bibliothèques **********
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DOSSIER_PROGRAMME = os.path.dirname(os.path.abspath(__file__))
+# Budgets par défaut (en s), médiane des mesures
+BUDGET_SANS_INTERFACE = 0.5
+BUDGET_FENETRE = 3.0
+
+# Code exécuté dans chaque interpréteur mesuré
+SCÉNARIO_SANS_INTERFACE = """
+import sys
+from QPlsc import lance_sans_interface
+lance_sans_interface('ABCBDAB', 'BDCABA')
+interdits = [m for m in sys.modules if m.split('.')[0] in ('qtpy', 'PyQt5', 'PIL')]
+sys.exit('Modules importés à tort: ' + ', '.join(interdits) if interdits else 0)
+"""
+SCÉNARIO_FENETRE = """
+import sys
+from qtpy.QtWidgets import QApplication
+from QPlscFenetres import Fenetre
+app = QApplication(sys.argv)
+frame = Fenetre()
+frame.widgetP.show()
+app.processEvents()
+interdits = [m for m in sys.modules if m.split('.')[0] == 'PIL']
+sys.exit('Modules importés à tort: ' + ', '.join(interdits) if interdits else 0)
+"""
+
+
+def mesure(scénario: str, repetitions: int) -> list:
+    """ Lance repetitions fois le scénario dans un nouvel interpréteur
+    Renvoie la liste des durées (en s). Lève RuntimeError en cas d'échec
+    """
+    environnement = dict(os.environ)
+    # Pas d'écran disponible: Qt dessine hors écran
+    if not environnement.get('DISPLAY') and sys.platform.startswith('linux'):
+        environnement.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    durées = []
+    for _ in range(repetitions):
+        début = time.perf_counter()
+        résultat = subprocess.run([sys.executable, '-c', scénario],
+                                  cwd=DOSSIER_PROGRAMME, env=environnement,
+                                  stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.PIPE, text=True)
+        durées.append(time.perf_counter() - début)
+        if résultat.returncode != 0:
+            raise RuntimeError(résultat.stderr.strip().splitlines()[-1])
+    return durées
+
+
+def qt_disponible() -> bool:
+    """ Indique si qtpy et une liaison Qt sont installés
+    """
+    résultat = subprocess.run([sys.executable, '-c', 'import qtpy.QtWidgets'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return résultat.returncode == 0
+
+
+# ********** Corps du programme **********
+if __name__ == '__main__':
+    analyseur = argparse.ArgumentParser(description="Mesure du démarrage à froid")
+    analyseur.add_argument('--repetitions', type=int, default=5)
+    analyseur.add_argument('--budget-sans-interface', type=float,
+                           default=BUDGET_SANS_INTERFACE)
+    analyseur.add_argument('--budget-fenetre', type=float, default=BUDGET_FENETRE)
+    args = analyseur.parse_args()
+    scénarios = [('Premier résultat (sans interface)', SCÉNARIO_SANS_INTERFACE,
+                  args.budget_sans_interface)]
+    if qt_disponible():
+        scénarios.append(('Première fenêtre', SCÉNARIO_FENETRE, args.budget_fenetre))
+    else:
+        print("Première fenêtre: non mesurée (Qt absent)")
+    échec = False
+    for nom, scénario, budget in scénarios:
+        try:
+            durées = mesure(scénario, args.repetitions)
+        except RuntimeError as erreur:
+            print("%s: ÉCHEC (%s)" % (nom, erreur))
+            échec = True
+            continue
+        médiane = statistics.median(durées)
+        dépassement = médiane > budget
+        échec = échec or dépassement
+        print("%s: médiane %.3f s, min %.3f s, max %.3f s, budget %.3f s%s"
+              % (nom, médiane, min(durées), max(durées), budget,
+                 " DÉPASSÉ" if dépassement else ""))
+    sys.exit(1 if échec else 0)
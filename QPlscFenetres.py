@@ -10,18 +10,20 @@ from qtpy import QtGui
 from qtpy.QtWidgets import (QLabel, QWidget, QHBoxLayout)
 from qtpy.QtWidgets import (QMainWindow, QDesktopWidget, QVBoxLayout)
 from qtpy.QtWidgets import (QPushButton, QSpinBox, QTextEdit, QCheckBox)
-from qtpy.QtWidgets import QFileDialog
-from qtpy.QtGui import QPainter, QColor, QPixmap, QImage
-from qtpy.QtCore import QRect, Qt, QBuffer, QIODevice
+from qtpy.QtGui import QPainter, QColor, QPixmap, QImage, QRegion
+from qtpy.QtCore import QRect, Qt
 # Système et gestion du temps
+import os
 import sys
 from time import sleep
-import io
 # Creation des classes ResoPLSC et Cases
 from QPlscStructures import Cases, ResoPLSC
+# PIL (sauvegarde des animations) et la boîte de dialogue d'exportation ne sont
+# importés qu'au moment d'une exportation
 
-from PIL import Image  # Pour la sauvegarde d'images animees
-# https://note.nkmk.me/en/python-pillow-gif/
+# Dossier du programme: les images des flèches y sont recherchées, quel que
+# soit le dossier de lancement
+DOSSIER_PROGRAMME = os.path.dirname(os.path.abspath(__file__))
 
 
 # ********** Classes **********
@@ -30,6 +32,8 @@ class ZoneDessin(QWidget):
     Progammation evenementielle: Lors de l'appel de la methode repaint(),
     les elements memorises dans l'objet reso sont redessines
     """
+    # Images d'origine des flèches, décodées une seule fois: nom -> QPixmap
+    images_flèches = {}
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -49,9 +53,23 @@ class ZoneDessin(QWidget):
         self.flèche_vertgris_mini = QPixmap()
         self.flèche_rouge = QPixmap()
         self.flèche_rouge_mini = QPixmap()
+        # Echelle des flèches miniatures actuelles (None: pas encore générées)
+        self.echelleFlèches = None
 
-    def dessine_tableau(self, p:QPainter):
+    @classmethod
+    def charge_flèche(cls, nom: str) -> QPixmap:
+        """ Renvoie l'image d'origine de la flèche 'tab_fleche_<nom>.png'
+        Le fichier n'est lu qu'au premier appel (QApplication doit exister)
+        """
+        if nom not in cls.images_flèches:
+            fichier = os.path.join(DOSSIER_PROGRAMME, "tab_fleche_" + nom + ".png")
+            cls.images_flèches[nom] = QPixmap(fichier)
+        return cls.images_flèches[nom]
+
+    def dessine_tableau(self, p:QPainter, zone:QRegion=None):
         """ Definition de toutes les etapes du dessin dans le QPainter
+        Si zone est renseignée, seuls les cases, segments et flèches qui
+        la touchent sont dessinés
         """
         ech = int(self.echelleDessin)
         # Mise à jour de la taille d'ecriture des lettres
@@ -59,30 +77,19 @@ class ZoneDessin(QWidget):
         echelle = int((2*ech)//3)
         font.setPointSize(max(1,echelle))
         p.setFont(font)
-        # Parcours la totalite des cases de reso pour les dessiner
-        for case in self.reso.cases:
-            # Recupère les paramètres de dessin des cases
-            label, case_x, case_y, col = case.param()
-            # Calcul les coordonnees en pixels (x et y) à partir de
-            # l'echelle et de la postion de la case dans le tableau
-            x = int(self.indice_vers_pixels(case_x))
-            y = int(self.indice_vers_pixels(case_y))
-            # Paramètre le stylo
-            color = QtGui.QColor(col[0], col[1], col[2])
-            p.setBrush(QColor((col[0]+255)//2, (col[1]+255)//2, (col[2]+255)//2))
-            pen = QtGui.QPen(color, 4)
-            p.setPen(pen)
-            # Dessine le rectangle à bord arrondis
-            m = int(ech//10)  # marges
-            p.drawRoundedRect(x+m, y+m, ech-m, ech-m, m, m)
-            # Change les paramètres du stylo pour ecrire la lettre
-            color = QtGui.QColor(col[0]//2, col[1]//2, col[2]//2)
-            pen = QtGui.QPen(color, 4)
-            p.setPen(pen)
-            # La lettre n'est pas ecrite si elle est illisble (trop petite)
-            if ech >= 12:
-                recText = QRect(x, y, ech, ech)
-                p.drawText(recText, 0x84, label)
+        if zone is None:
+            # Parcours la totalite des cases de reso pour les dessiner
+            cases = self.reso.cases
+            cellules = [(i, j) for j in range(len(self.reso.tableau))
+                        for i in range(len(self.reso.tableau[0]))]
+        else:
+            # Même ordre que le dessin complet: à petite échelle, les cases
+            # voisines se chevauchent
+            cellules = sorted(self.cellules_dans(zone), key=lambda c: (c[1], c[0]))
+            retenues = set(cellules)
+            cases = [case for case in self.reso.cases if (case.x, case.y) in retenues]
+        for case in cases:
+            self.dessine_case(p, case)
         # Dessine les portions de chemins retraçant les backtracking
         if self.reso.chemin is not None:
             col = self.reso.couleurs['actif']
@@ -95,18 +102,76 @@ class ZoneDessin(QWidget):
                 y1 = int(self.indice_vers_pixels(chemin[0][1]) + ech//2)
                 x2 = int(self.indice_vers_pixels(chemin[1][0]) + ech//2)
                 y2 = int(self.indice_vers_pixels(chemin[1][1]) + ech//2)
+                if zone is not None:
+                    contour = QRect(min(x1, x2) - ech//10, min(y1, y2) - ech//10,
+                                    abs(x2 - x1) + ech//5 + 1, abs(y2 - y1) + ech//5 + 1)
+                    if not zone.intersects(contour):
+                        continue
                 p.drawLine(x1, y1, x2, y2)
         # Dessine les flèches
-        for j in range(len(self.reso.tableau)):
-            for i in range(len(self.reso.tableau[0])):
-                x = int(self.indice_vers_pixels(i) - ech//3)
-                y = int(self.indice_vers_pixels(j) - ech//3)
-                if self.reso.flèches[j][i] == 'vert_actif':
-                    p.drawPixmap(x, y, self.flèche_verte_mini)
-                if self.reso.flèches[j][i] == 'vert_passif':
-                    p.drawPixmap(x, y, self.flèche_vertgris_mini)
-                if self.reso.flèches[j][i] == 'rouge_max':
-                    p.drawPixmap(x, y, self.flèche_rouge_mini)
+        for i, j in cellules:
+            if not (0 <= j < len(self.reso.flèches) and 0 <= i < len(self.reso.flèches[0])):
+                continue
+            x = int(self.indice_vers_pixels(i) - ech//3)
+            y = int(self.indice_vers_pixels(j) - ech//3)
+            if self.reso.flèches[j][i] == 'vert_actif':
+                p.drawPixmap(x, y, self.flèche_verte_mini)
+            if self.reso.flèches[j][i] == 'vert_passif':
+                p.drawPixmap(x, y, self.flèche_vertgris_mini)
+            if self.reso.flèches[j][i] == 'rouge_max':
+                p.drawPixmap(x, y, self.flèche_rouge_mini)
+
+    def dessine_case(self, p:QPainter, case:Cases):
+        """ Dessine une case (rectangle à bords arrondis et label)
+        """
+        ech = int(self.echelleDessin)
+        # Recupère les paramètres de dessin des cases
+        label, case_x, case_y, col = case.param()
+        # Calcul les coordonnees en pixels (x et y) à partir de
+        # l'echelle et de la postion de la case dans le tableau
+        x = int(self.indice_vers_pixels(case_x))
+        y = int(self.indice_vers_pixels(case_y))
+        # Paramètre le stylo
+        color = QtGui.QColor(col[0], col[1], col[2])
+        p.setBrush(QColor((col[0]+255)//2, (col[1]+255)//2, (col[2]+255)//2))
+        pen = QtGui.QPen(color, 4)
+        p.setPen(pen)
+        # Dessine le rectangle à bord arrondis
+        m = int(ech//10)  # marges
+        p.drawRoundedRect(x+m, y+m, ech-m, ech-m, m, m)
+        # Change les paramètres du stylo pour ecrire la lettre
+        color = QtGui.QColor(col[0]//2, col[1]//2, col[2]//2)
+        pen = QtGui.QPen(color, 4)
+        p.setPen(pen)
+        # La lettre n'est pas ecrite si elle est illisble (trop petite)
+        if ech >= 12:
+            recText = QRect(x, y, ech, ech)
+            p.drawText(recText, 0x84, label)
+
+    def cellules_dans(self, zone:QRegion) -> set:
+        """ Renvoie les positions (i, j) du tableau (marges -1 comprises) dont
+        la case ou la flèche touche la zone
+        """
+        ech = max(1, int(self.echelleDessin))
+        débord = max(ech//3, 3)
+        décalage = self.echelleDessin*self.marge//2
+        def indice(pixel):
+            # Inverse de indice_vers_pixels (arrondi par défaut)
+            return int((pixel - décalage) // ech) - 1
+        i_max = len(self.reso.X) - 1
+        j_max = len(self.reso.Y) - 1
+        cellules = set()
+        for rect in zone.rects():
+            # Une case occupe [pixel - débord, pixel + ech + 3] avec sa flèche
+            # et son contour (crayon de 4 pixels, anticrénelage)
+            i_début = max(-1, indice(rect.left() - ech - 3))
+            i_fin = min(i_max, indice(rect.right() + débord) + 1)
+            j_début = max(-1, indice(rect.top() - ech - 3))
+            j_fin = min(j_max, indice(rect.bottom() + débord) + 1)
+            for j in range(j_début, j_fin + 1):
+                for i in range(i_début, i_fin + 1):
+                    cellules.add((i, j))
+        return cellules
 
     def indice_vers_pixels(self, indice: int) -> int:
         """ Prend l'indice d'une position dans le tableau et le traduit en
@@ -115,13 +180,36 @@ class ZoneDessin(QWidget):
         echelle = self.echelleDessin
         return echelle*self.marge//2 + (indice+1) * echelle
 
+    def région_modifiée(self, cases: list, segments) -> QRegion:
+        """ Renvoie la zone de l'écran occupée par les cases (x, y) (flèche
+        comprise) et par les segments ((x1, y1),(x2, y2)) du tracé
+        """
+        ech = int(self.echelleDessin)
+        # La flèche d'une case déborde de ech//3 en haut et à gauche (son
+        # contour d'au plus 3 pixels), le contour de 3 pixels en bas et à droite
+        débord = max(ech//3, 3)
+        région = QRegion()
+        for x, y in cases:
+            px = int(self.indice_vers_pixels(x) - débord)
+            py = int(self.indice_vers_pixels(y) - débord)
+            région = région.united(QRect(px, py, ech + débord + 4, ech + débord + 4))
+        for (x1, y1), (x2, y2) in segments:
+            # Les segments relient les centres des cases (épaisseur ech//10)
+            px = int(self.indice_vers_pixels(min(x1, x2)))
+            py = int(self.indice_vers_pixels(min(y1, y2)))
+            largeur = (abs(x2 - x1) + 1) * ech + 1
+            hauteur = (abs(y2 - y1) + 1) * ech + 1
+            région = région.united(QRect(px, py, largeur, hauteur))
+        return région
+
     def paintEvent(self, event):
         """ Lance le dessin des differents objets (flèches, cases, lignes)
         dans la zone de dessin
         """
         p = QPainter()
         p.begin(self)
-        self.dessine_tableau(p)
+        # Seule la zone à rafraîchir est redessinée
+        self.dessine_tableau(p, event.region())
         p.end()
 
 class Fenetre(QMainWindow):
@@ -137,6 +225,10 @@ class Fenetre(QMainWindow):
         # Inidque si la destinaion est un dessin ou une exportation vers un fichier
         self.destinationFichier = False
         self.genère_animation = False  # Image unique ou animation
+        # Chemin actuellement tracé (None: traces à redessiner entièrement)
+        # et état de boxSelectionToutesPlsc lors de ce tracé
+        self.chemin_affiché = None
+        self.toutes_affichées = False
         # Liste des images de l'animation
         self.images = []  # L'image d'indice 0 est une image vierge, transparente
         self.setWindowTitle("PLSC")
@@ -264,6 +356,7 @@ class Fenetre(QMainWindow):
         self.dessine_nouvelle_image()
         self.recherche_plsc()
         # Selection du chemin et fichier  pour l'enregistrement
+        from qtpy.QtWidgets import QFileDialog
         chemin, extension = QFileDialog.getSaveFileName(self, "Enregistrer l'image", "",
                                                         "Images (*.png *.apng *.gif)")
         # Si la saisie est vide, alors termine l'appel de la fonction
@@ -311,43 +404,78 @@ class Fenetre(QMainWindow):
         p.end()
         self.images.append(image)
 
-    def dessine_trace(self, _piste: list):
+    def actualise_dernière_image(self, région:QRegion):
+        """ Redessine, dans la dernière image de self.images, la seule région
+        modifiée (sans ajouter d'image)
+        """
+        image = self.images[-1]
+        région = région.intersected(QRegion(image.rect()))
+        # Efface la région en y recopiant, ligne par ligne, les octets de
+        # l'image vierge: un QPainter enregistrerait en noir ses pixels
+        # blancs transparents
+        pixels = octets_image(image)
+        pixels_vierges = octets_image(self.images[0])
+        octets_ligne = image.bytesPerLine()
+        for rect in région.rects():
+            for y in range(rect.top(), rect.bottom() + 1):
+                début = y*octets_ligne + 4*rect.left()
+                fin = début + 4*rect.width()
+                pixels[début:fin] = pixels_vierges[début:fin]
+        p = QPainter()
+        p.begin(image)
+        p.setClipRegion(région)
+        self.dessin.dessine_tableau(p, région)
+        p.end()
+
+    def dessine_trace(self, chemin_sélection: int):
         """ Dessine le parcours du retour sur trace (backtracking)
-        _piste est une liste des tuples des coordonnees des points des
-        caractères de la PLSC selectionnee.
+        chemin_sélection est l'indice dans T.chemins de la PLSC selectionnee.
         Repasse en vert les caractères selectionnes sur X et Y.
         Construit un chemin en pointilles reliant les ponts
         Passe en vert clair les ponts actifs
         """
         T = self.dessin.reso
-        # Initialisation du chemin
-        T.chemin = []
-        point_origine = (len(T.X)-1, len(T.Y)-1)
         # Initialise toutes les flèches: Soit effacees, soit passees en 'vert_passif'
         # selon la case self.boxSelectionToutesPlsc
+        self.toutes_affichées = self.boxSelectionToutesPlsc.isChecked()
         for ponts_valeur in T.ponts:
             for pont in ponts_valeur:
-                if self.boxSelectionToutesPlsc.isChecked():
+                if self.toutes_affichées:
                     T.flèches[pont[1]][pont[0]] = 'vert_passif'
                 else:
                     T.flèches[pont[1]][pont[0]] = None
-        couleur_ref = 'actif'
-        for i in range(1, len(_piste)):
-            point_destination = _piste[i]
-            x_origine = point_origine[0]
-            y_origine = point_origine[1]
-            x_destination = point_destination[0]
-            y_destination = point_destination[1]
-            case_active_X = T.cherche_case(-1, y_destination)
-            case_active_Y = T.cherche_case(x_destination, -1)
-            case_active_X.couleur = T.couleurs[couleur_ref]
-            case_active_Y.couleur = T.couleurs[couleur_ref]
-            T.chemin.append(((x_origine, y_origine), (x_destination, y_origine)))
-            T.chemin.append(((x_destination, y_origine), (x_destination, y_destination)))
-            T.chemin.append(((x_destination, y_destination), (x_destination-1, y_destination-1)))
-            # Les ponts sur le chemin de la PLSC passent en clair
-            T.flèches[y_destination][x_destination] ='vert_actif'
-            point_origine = (x_destination-1, y_destination-1)
+        self.marque_ponts(T.chemins[chemin_sélection][1:], 'actif', 'vert_actif')
+        T.chemin = T.segments_chemin(chemin_sélection)
+        self.chemin_affiché = chemin_sélection
+
+    def marque_ponts(self, ponts: list, couleur_ref: str, type_flèche):
+        """ Passe les caractères de X et Y des ponts dans la couleur couleur_ref
+        et leurs flèches dans l'état type_flèche
+        """
+        T = self.dessin.reso
+        for x, y in ponts:
+            T.cherche_case(-1, y).couleur = T.couleurs[couleur_ref]
+            T.cherche_case(x, -1).couleur = T.couleurs[couleur_ref]
+            T.flèches[y][x] = type_flèche
+
+    def modifie_trace(self, chemin_sélection: int) -> QRegion:
+        """ Passe du chemin actuellement tracé au chemin chemin_sélection en
+        ne modifiant que les ponts qui diffèrent entre les deux.
+        Renvoie la zone de l'écran à redessiner
+        """
+        T = self.dessin.reso
+        quittés, atteints = T.chemins.différence(self.chemin_affiché, chemin_sélection)
+        type_flèche = 'vert_passif' if self.toutes_affichées else None
+        # Les ponts quittés d'abord: un pont présent dans les deux reste actif
+        self.marque_ponts(quittés, 'base', type_flèche)
+        self.marque_ponts(atteints, 'actif', 'vert_actif')
+        chemin = T.segments_chemin(chemin_sélection)
+        segments = set(T.chemin) ^ set(chemin)
+        T.chemin = chemin
+        self.chemin_affiché = chemin_sélection
+        cases = quittés + atteints
+        cases += [(-1, y) for _, y in cases] + [(x, -1) for x, _ in cases]
+        return self.dessin.région_modifiée(cases, segments)
 
     def efface_traces(self):
         """ Repasse tous les caractères de X et Y en couleur de 'base'
@@ -385,24 +513,22 @@ class Fenetre(QMainWindow):
         self.initialise_axes()
         # Initialise le reste du tableau
         self.reponse.setPlainText("")  # Vide la zone de texte de reponse
+        self.chemin_affiché = None
         T = self.dessin.reso
         m = len(T.X)
         n = len(T.Y)
         # Cree et initialise le tableau des flèches (m*n) cases
         T.flèches = [[None]*(m) for _ in range(n)]
-        # Cree et initialise le tableau des valeurs (m*n) cases
-        T.tableau = [[0]*(m) for _ in range(n)]
-        # Cree et initialise le tableau des ponts (cases (i, j) verifiant X[i] = Y[j])
-        valeur_max = min(m, n) # La PLSC est forcement plus petite que la plus petite sequence
-        T.ponts = [[] for _ in range(valeur_max)]
+        # Cree et initialise le tableau des valeurs (m*n) cases et celui des ponts
+        T.initialise_tableau()
         # Initialise la première ligne et la première colonne à 0
         for i in range(len(T.X)):
             c = Cases('0', i, 0, T.couleurs['neutre'])
-            T.cases.append(c)
+            T.ajoute_case(c)
             T.tableau[0][i] = 0
         for j in range(len(T.Y)):
             c = Cases('0', 0, j, T.couleurs['neutre'])
-            T.cases.append(c)
+            T.ajoute_case(c)
             T.tableau[j][0] = 0
         # Lance la mise à jour des elements à dessiner (Cases et flèches)
         if self.boxInitialisation:
@@ -415,7 +541,7 @@ class Fenetre(QMainWindow):
         zones de texte
         """
         T = self.dessin.reso
-        T.cases = []
+        T.efface_cases()
         T.chemin = []
         # T.flèches = []
         # T.X est une liste de caractère: caractères de la sequence1 precedes  par ''
@@ -434,16 +560,16 @@ class Fenetre(QMainWindow):
         # Les 'descriteurs' X et Y sont dans les arges: abscisses -1 et ordonnees -1
         # Ajoute le caractère vide '∅' en en-tête de X
         c = Cases(chr(8709), 0, -1, T.couleurs['base'])
-        T.cases.append(c)
+        T.ajoute_case(c)
         # Ajoute le caractère vide '∅' en en-tête de Y
         c = Cases(chr(8709), -1, 0, T.couleurs['base'])
-        T.cases.append(c)
+        T.ajoute_case(c)
         for i in range(1,len(T.X)):
             c = Cases(T.X[i], i, -1, T.couleurs['base'])
-            T.cases.append(c)
+            T.ajoute_case(c)
         for j in range(1,len(T.Y)):
             c = Cases(T.Y[j], -1, j, T.couleurs['base'])
-            T.cases.append(c)
+            T.ajoute_case(c)
 
     def initialise_image_vierge(self, largeur:int, hauteur:int):
         """ Créé une première image dans self.images qui est une image vierge
@@ -462,7 +588,6 @@ class Fenetre(QMainWindow):
         modification du QSpinBox associe
         """
         T = self.dessin.reso
-        chemin_selection = self.spinSelectionPlsc.value()
         maxParamSolution = max(0, len(T.chemins)-1)
         self.spinSelectionPlsc.setMaximum(maxParamSolution+1)
         if self.spinSelectionPlsc.value() == maxParamSolution+1:
@@ -470,12 +595,29 @@ class Fenetre(QMainWindow):
         self.spinSelectionPlsc.setMinimum(-1)
         if self.spinSelectionPlsc.value() == -1:
             self.spinSelectionPlsc.setValue(maxParamSolution)
-        self.efface_traces()
-        if chemin_selection < len(T.chemins):
-            piste = T.chemins[chemin_selection]
-            self.dessine_trace(piste)
-        self.dessine_nouvelle_image()
-        self.dessin.repaint()
+        # Valeur éventuellement corrigée (parcours cyclique des solutions)
+        chemin_selection = self.spinSelectionPlsc.value()
+        toutes = self.boxSelectionToutesPlsc.isChecked()
+        if chemin_selection >= len(T.chemins):
+            self.efface_traces()
+            self.chemin_affiché = None
+            région = None
+        elif self.chemin_affiché is None or toutes != self.toutes_affichées:
+            self.efface_traces()
+            self.dessine_trace(chemin_selection)
+            région = None
+        else:
+            # Seules les cases qui changent d'état sont modifiées et redessinées
+            région = self.modifie_trace(chemin_selection)
+        if région is None or len(self.images) < 2:
+            self.dessine_nouvelle_image()
+        elif not région.isEmpty():
+            # L'image vierge self.images[0] n'est jamais modifiée
+            self.actualise_dernière_image(région)
+        if région is None:
+            self.dessin.repaint()
+        elif not région.isEmpty():
+            self.dessin.repaint(région)
 
     def recherche_plsc(self):
         """ Initialise le tableau de recherche et le dessin du tableau
@@ -490,43 +632,34 @@ class Fenetre(QMainWindow):
         # Lance la mise à jour des elements à dessiner (Cases et flèches)
         T = self.dessin.reso
         duree = self.temps_par_image()
-        # Parcours toutes les colonne de  chaque ligne pour creer les cases
-        # et mettre à jour les flèches et les ponts
-        for ligne in range(1, len(T.Y)):
-            for colonne in range(1, len(T.X)):
-                if T.X[colonne] == T.Y[ligne]:
-                    couleur_ref = 'actif'
-                    T.tableau[ligne][colonne] = T.tableau[ligne-1][colonne-1]+1
-                    valeur = T.tableau[ligne][colonne]
-                    T.ponts[valeur].append((colonne, ligne))
-                    c = Cases(str(valeur), colonne, ligne, T.couleurs['neutre'])
-                    T.cases.append(c)
-                    type_flèche = 'vert_actif'
-                else:
-                    couleur_ref = 'alerte'
-                    haut = T.tableau[ligne-1][colonne]
-                    gauche = T.tableau[ligne][colonne-1]
-                    T.tableau[ligne][colonne] = max(haut, gauche)
-                    c = Cases(str(T.tableau[ligne][colonne]), colonne, ligne, T.couleurs['neutre'])
-                    T.cases.append(c)
-                    type_flèche = 'rouge_max'
-                if self.boxCompletion.isChecked():
-                    T.flèches [ligne][colonne] = type_flèche
-                    case_active_X = T.cherche_case(-1, ligne)
-                    case_active_Y = T.cherche_case(colonne, -1)
-                    case_active_X.couleur = T.couleurs[couleur_ref]
-                    case_active_Y.couleur = T.couleurs[couleur_ref]
-                    sleep(duree)
-                    self.dessine_nouvelle_image()
-                    self.dessin.repaint()
-                    case_active_X.couleur = T.couleurs['base']
-                    case_active_Y.couleur = T.couleurs['base']
+        # Parcours toutes les colonne de  chaque ligne (T remplit le tableau et
+        # les ponts) pour creer les cases et mettre à jour les flèches
+        for ligne, colonne, pont in T.parcours_tableau():
+            if pont:
+                couleur_ref = 'actif'
+                type_flèche = 'vert_actif'
+            else:
+                couleur_ref = 'alerte'
+                type_flèche = 'rouge_max'
+            c = Cases(str(T.tableau[ligne][colonne]), colonne, ligne, T.couleurs['neutre'])
+            T.ajoute_case(c)
+            if self.boxCompletion.isChecked():
+                T.flèches [ligne][colonne] = type_flèche
+                case_active_X = T.cherche_case(-1, ligne)
+                case_active_Y = T.cherche_case(colonne, -1)
+                case_active_X.couleur = T.couleurs[couleur_ref]
+                case_active_Y.couleur = T.couleurs[couleur_ref]
+                sleep(duree)
+                self.dessine_nouvelle_image()
+                self.dessin.repaint()
+                case_active_X.couleur = T.couleurs['base']
+                case_active_Y.couleur = T.couleurs['base']
         if self.boxCompletion.isChecked():
             self.dessin.repaint()
         j_max = len(T.tableau)-1  # Indice max des lignes
         i_max = len(T.tableau[0])-1  # Indice max des colonnes
         valeur_max = T.tableau[j_max][i_max]  # Valeur de la dernière case
-        T.chemins = T.backtracking_mem(i_max, j_max, valeur_max, [])
+        T.chemins = T.backtracking_arbre(i_max, j_max, valeur_max)
         maxParamSolution = max(0, len(T.chemins)-1)
         self.spinSelectionPlsc.setMaximum(maxParamSolution)
         chemin_selection = self.spinSelectionPlsc.value()
@@ -536,12 +669,17 @@ class Fenetre(QMainWindow):
             self.mise_a_jour_chemin()
 
     def redimensionne_flèches(self):
+        """ Met à jour les flèches miniatures si l'échelle du dessin a changé
+        """
         D = self.dessin
         ech = D.echelleDessin
-        D.flèche_verte.load("tab_fleche_verte.png")
-        D.flèche_vertgris.load("tab_fleche_vertgris.png")
-        D.flèche_rouge.load("tab_fleche_rouge.png")
         echelle = int((ech*2)//3)
+        if echelle == D.echelleFlèches:
+            return
+        D.echelleFlèches = echelle
+        D.flèche_verte = ZoneDessin.charge_flèche("verte")
+        D.flèche_vertgris = ZoneDessin.charge_flèche("vertgris")
+        D.flèche_rouge = ZoneDessin.charge_flèche("rouge")
         D.flèche_verte_mini = D.flèche_verte.scaled(echelle, echelle)
         D.flèche_vertgris_mini = D.flèche_vertgris.scaled(echelle, echelle)
         D.flèche_rouge_mini = D.flèche_rouge.scaled(echelle, echelle)
@@ -594,11 +732,24 @@ class Fenetre(QMainWindow):
         duree = duree_totale / nb_cases
         return duree
 
+def octets_image(image:QImage) -> memoryview:
+    """ Renvoie les octets (modifiables) des pixels d'une QImage
+    """
+    octets = image.bits()
+    # PyQt renvoie un pointeur dont la taille doit être précisée
+    if hasattr(octets, 'setsize'):
+        octets.setsize(image.sizeInBytes())
+    return memoryview(octets)
+
 def conversion_QImages_vers_GIF(listeQImages:list)->list:
     """Prend une liste de QImages et la converti en liste d'Images (PIL)
     en prevision d'une exportation en GIF anime
     Renvoie la liste de GIF
     """
+    import io
+    from qtpy.QtCore import QBuffer, QIODevice
+    from PIL import Image  # Pour la sauvegarde d'images animees
+    # https://note.nkmk.me/en/python-pillow-gif/
     # Initialisation
     listeImagesGIF = []
     # Parcours de la liste des QImages
@@ -0,0 +1,430 @@
+# coding: utf-8
+"""
+Service HTTP/JSON local (asyncio) exposant la recherche de PLSC sans interface
+graphique.
+Les requêtes concurrentes sont regroupées en lots (micro-batching) et résolues
+par un groupe de processus exécutant ResoPLSC.
+
+Requête:  POST /plsc  {"x": "...", "y": "...", "requete": "longueur"|"plsc"|
+                       "nombre"|"kieme", "k": 0}
+Mesures:  GET /metriques
+Lancement: python QPlscServeur.py --port 8765
+"""
+
+# ********** Bibliothèques **********
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+# Creation de la classe ResoPLSC
+from QPlscStructures import ResoPLSC
+
+REQUETES = ('longueur', 'plsc', 'nombre', 'kieme')
+RAISONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 413: 'Payload Too Large',
+           431: 'Request Header Fields Too Large',
+           500: 'Internal Server Error', 503: 'Service Unavailable'}
+# Nombre maximal de lignes d'en-tête d'une requête HTTP
+MAX_ENTETES = 100
+# Attente maximale (en s) de la fin des connexions à l'arrêt du serveur
+DELAI_ARRET = 1.0
+
+
+# ********** Fonctions exécutées dans les processus **********
+def résous_requête(requête: dict) -> dict:
+    """ Résout une requête déjà validée. Renvoie le dictionnaire de réponse
+    """
+    T = ResoPLSC()
+    longueur = T.calcule_tableau(requête['x'], requête['y'])
+    réponse = {'longueur': longueur}
+    if requête['requete'] == 'longueur':
+        return réponse
+    i_max = len(T.X) - 1
+    j_max = len(T.Y) - 1
+    if requête['requete'] == 'nombre':
+        réponse['nombre'] = T.compte_chemins(i_max, j_max, longueur)
+        return réponse
+    if requête['requete'] == 'kieme':
+        k = requête.get('k', 0)
+        chemin = T.chemin_numéro(k)
+        if chemin is None:
+            return {'erreur': 'k hors limites'}
+        réponse['k'] = k
+    else:
+        # Une PLSC quelconque: retour sur trace direct, sans compter les chemins
+        chemin = T.chemin_direct()
+    réponse['plsc'] = T.chaîne_du_chemin(chemin)
+    # Positions (indices à partir de 0) des caractères de la PLSC dans x et y
+    réponse['positions'] = [(case[0]-1, case[1]-1) for case in reversed(chemin[1:])]
+    return réponse
+
+
+def résous_lot(requêtes: list) -> list:
+    """ Résout un lot de requêtes dans un même processus.
+    Une erreur sur une requête n'affecte pas les autres: elle est signalée
+    avec le statut HTTP 500 (erreur du serveur)
+    """
+    réponses = []
+    for requête in requêtes:
+        try:
+            réponses.append(résous_requête(requête))
+        except Exception as erreur:
+            réponses.append({'erreur': type(erreur).__name__, 'statut': 500})
+    return réponses
+
+
+def valide_requête(données) -> str:
+    """ Renvoie un message d'erreur si la requête est invalide, None sinon
+    """
+    if not isinstance(données, dict):
+        return "objet JSON attendu"
+    for clé in ('x', 'y'):
+        if not isinstance(données.get(clé), str):
+            return "'" + clé + "' doit être une chaîne"
+    if données.get('requete', 'plsc') not in REQUETES:
+        return "'requete' doit valoir " + ", ".join(REQUETES)
+    k = données.get('k', 0)
+    if not isinstance(k, int) or isinstance(k, bool) or k < 0:
+        return "'k' doit être un entier positif"
+    return None
+
+
+# ********** Classes **********
+class Mesures:
+    """ Compteurs de latence et de débit du service
+    """
+
+    def __init__(self, taille_historique=1000):
+        self.début = time.monotonic()
+        self.requêtes = 0
+        self.rejets = 0
+        self.erreurs = 0
+        self.lots = 0
+        self.requêtes_par_lot = 0
+        # Latences (en s) des dernières requêtes traitées
+        self.latences = deque(maxlen=taille_historique)
+
+    def enregistre_lot(self, taille: int):
+        """ Compte un lot de taille requêtes envoyé au groupe de processus
+        """
+        self.lots += 1
+        self.requêtes_par_lot += taille
+
+    def enregistre_requête(self, latence: float):
+        """ Compte une requête résolue et sa latence (en s)
+        """
+        self.requêtes += 1
+        self.latences.append(latence)
+
+    def résumé(self, en_attente: int) -> dict:
+        """ Renvoie les mesures sous forme de dictionnaire (sérialisable JSON)
+        """
+        durée = max(time.monotonic() - self.début, 1e-9)
+        latences = sorted(self.latences)
+        def centile(p):
+            if not latences:
+                return 0.0
+            return 1000 * latences[min(len(latences)-1, int(p * len(latences)))]
+        return {'requetes': self.requêtes,
+                'rejets': self.rejets,
+                'erreurs': self.erreurs,
+                'lots': self.lots,
+                'taille_moyenne_lot': self.requêtes_par_lot / max(1, self.lots),
+                'en_attente': en_attente,
+                'debit_par_s': self.requêtes / durée,
+                'latence_ms': {'p50': centile(0.50), 'p95': centile(0.95),
+                               'p99': centile(0.99), 'max': centile(1.0)}}
+
+
+class ServeurPLSC:
+    """ Serveur HTTP/JSON asyncio.
+    Les requêtes sont placées dans une file bornée (contre-pression: réponse
+    503 quand elle est pleine) puis regroupées en lots d'au plus taille_lot
+    requêtes, ou après delai_lot secondes, et envoyées au groupe de processus.
+    """
+
+    def __init__(self, hôte='127.0.0.1', port=8765, processus=None,
+                 taille_lot=32, delai_lot=0.005, max_en_attente=256,
+                 taille_max_corps=1 << 20, taille_max_tableau=1000000):
+        self.hôte = hôte
+        self.port = port
+        self.processus = processus or os.cpu_count() or 1
+        self.taille_lot = taille_lot
+        self.delai_lot = delai_lot
+        self.max_en_attente = max_en_attente
+        self.taille_max_corps = taille_max_corps
+        # Nombre maximal de cases len(x)*len(y) du tableau d'une requête: la
+        # résolution est en O(len(x)*len(y)), en temps comme en mémoire
+        self.taille_max_tableau = taille_max_tableau
+        self.mesures = Mesures()
+        self.file = None  # Créée dans la boucle asyncio par démarre()
+        self.groupe = None
+        self.serveur = None
+        self.tâche_lots = None
+        self.lots_en_cours = None
+        # Tâches de résolution des lots: la boucle asyncio ne garde qu'une
+        # référence faible aux tâches
+        self.tâches_résolution = set()
+        # Connexions ouvertes (écrivain -> tâche de traitement) et connexions
+        # keep-alive en attente d'une nouvelle requête
+        self.connexions = {}
+        self.inactives = set()
+
+    async def démarre(self):
+        """ Ouvre le port d'écoute et lance la constitution des lots.
+        Renvoie le port effectivement utilisé (utile avec port=0)
+        """
+        self.file = asyncio.Queue(self.max_en_attente)
+        # 'spawn': les processus n'héritent pas des sockets des connexions
+        # ouvertes (un 'fork' tardif empêcherait leur fermeture)
+        self.groupe = ProcessPoolExecutor(self.processus,
+                                          multiprocessing.get_context('spawn'))
+        # Démarre les processus avant la première requête
+        boucle = asyncio.get_running_loop()
+        await asyncio.gather(*[boucle.run_in_executor(self.groupe, résous_lot, [])
+                               for _ in range(self.processus)])
+        # Un lot par processus au maximum est en cours de résolution
+        self.lots_en_cours = asyncio.Semaphore(self.processus)
+        self.tâche_lots = asyncio.create_task(self.constitue_lots())
+        self.serveur = await asyncio.start_server(self.traite_connexion,
+                                                  self.hôte, self.port)
+        self.port = self.serveur.sockets[0].getsockname()[1]
+        return self.port
+
+    async def arrête(self):
+        """ Ferme le port d'écoute, la tâche des lots et le groupe de processus.
+        Les lots en cours de résolution sont terminés, les requêtes encore dans
+        la file reçoivent une réponse 503 et les connexions ouvertes sont
+        fermées après leur dernière réponse
+        """
+        self.serveur.close()
+        self.tâche_lots.cancel()
+        try:
+            await self.tâche_lots
+        except asyncio.CancelledError:
+            pass
+        while not self.file.empty():
+            self.rejette([self.file.get_nowait()])
+        await asyncio.gather(*self.tâches_résolution)
+        # Les connexions inactives sont fermées tout de suite, les autres
+        # répondent avec 'Connection: close'
+        for écrivain in self.inactives:
+            écrivain.close()
+        if self.connexions:
+            _, restantes = await asyncio.wait(list(self.connexions.values()),
+                                              timeout=DELAI_ARRET)
+            # Coupe les connexions des clients qui n'ont pas fini d'envoyer
+            # leur requête ou de lire leur réponse
+            for écrivain in list(self.connexions):
+                écrivain.transport.abort()
+            if restantes:
+                await asyncio.wait(restantes)
+        await self.serveur.wait_closed()
+        # Sans attendre les processus, pour ne pas bloquer la boucle asyncio
+        self.groupe.shutdown(wait=False, cancel_futures=True)
+
+    async def constitue_lots(self):
+        """ Boucle de regroupement des requêtes en attente dans la file
+        """
+        boucle = asyncio.get_running_loop()
+        while True:
+            lot = []
+            try:
+                lot.append(await self.file.get())
+                échéance = boucle.time() + self.delai_lot
+                while len(lot) < self.taille_lot:
+                    restant = échéance - boucle.time()
+                    if restant <= 0:
+                        break
+                    try:
+                        lot.append(await asyncio.wait_for(self.file.get(), restant))
+                    except asyncio.TimeoutError:
+                        break
+                await self.lots_en_cours.acquire()
+            except asyncio.CancelledError:
+                # Arrêt du serveur: le lot déjà retiré de la file ne sera pas résolu
+                self.rejette(lot)
+                raise
+            tâche = asyncio.create_task(self.résous(lot))
+            self.tâches_résolution.add(tâche)
+            tâche.add_done_callback(self.tâches_résolution.discard)
+
+    def rejette(self, lot: list):
+        """ Répond 503 aux requêtes d'un lot qui ne sera pas résolu
+        """
+        for _, futur in lot:
+            if not futur.done():
+                futur.set_result({'erreur': 'serveur arrêté', 'statut': 503})
+
+    async def résous(self, lot: list):
+        """ Envoie un lot au groupe de processus et transmet les réponses
+        """
+        boucle = asyncio.get_running_loop()
+        try:
+            self.mesures.enregistre_lot(len(lot))
+            requêtes = [requête for requête, _ in lot]
+            try:
+                réponses = await boucle.run_in_executor(self.groupe, résous_lot,
+                                                        requêtes)
+            except Exception as erreur:
+                réponses = [{'erreur': type(erreur).__name__, 'statut': 500}
+                            for _ in lot]
+            for (_, futur), réponse in zip(lot, réponses):
+                if not futur.done():
+                    futur.set_result(réponse)
+        finally:
+            self.lots_en_cours.release()
+
+    async def soumets(self, requête: dict) -> dict:
+        """ Place une requête dans la file et attend sa réponse.
+        Renvoie None si la file est pleine
+        """
+        futur = asyncio.get_running_loop().create_future()
+        try:
+            self.file.put_nowait((requête, futur))
+        except asyncio.QueueFull:
+            return None
+        return await futur
+
+    async def traite_connexion(self, lecteur, écrivain):
+        """ Traite les requêtes HTTP/1.1 d'une connexion (keep-alive)
+        """
+        self.connexions[écrivain] = asyncio.current_task()
+        try:
+            while True:
+                self.inactives.add(écrivain)
+                try:
+                    ligne = await lecteur.readline()
+                    self.inactives.discard(écrivain)
+                    if not ligne:
+                        break
+                    début = time.monotonic()
+                    méthode, chemin, _ = ligne.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    # Ligne mal formée ou plus longue que la limite du lecteur
+                    await self.répond(écrivain, 400, {'erreur': 'requête HTTP invalide'}, False)
+                    break
+                try:
+                    entêtes = await self.lit_entêtes(lecteur)
+                except ValueError:
+                    await self.répond(écrivain, 431, {'erreur': 'en-têtes trop longs'}, False)
+                    break
+                garder = entêtes.get('connection', '').lower() != 'close'
+                try:
+                    longueur = int(entêtes.get('content-length', 0) or 0)
+                except ValueError:
+                    longueur = -1
+                if not 0 <= longueur <= self.taille_max_corps:
+                    await self.répond(écrivain, 413, {'erreur': 'corps trop volumineux'}, False)
+                    break
+                corps = await lecteur.readexactly(longueur) if longueur else b''
+                statut, réponse = await self.route(méthode, chemin, corps)
+                if statut == 200 and chemin == '/plsc':
+                    self.mesures.enregistre_requête(time.monotonic() - début)
+                garder = garder and self.serveur.is_serving()
+                await self.répond(écrivain, statut, réponse, garder)
+                if not garder:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.inactives.discard(écrivain)
+            del self.connexions[écrivain]
+            écrivain.close()
+
+    async def lit_entêtes(self, lecteur) -> dict:
+        """ Lit les lignes d'en-tête jusqu'à la ligne vide.
+        Lève ValueError si une ligne dépasse la limite du lecteur (64 Kio) ou
+        s'il y a plus de MAX_ENTETES lignes
+        """
+        entêtes = {}
+        for _ in range(MAX_ENTETES + 1):
+            ligne = await lecteur.readline()
+            if ligne in (b'\r\n', b'\n', b''):
+                return entêtes
+            clé, _, valeur = ligne.decode('latin-1').partition(':')
+            entêtes[clé.strip().lower()] = valeur.strip()
+        raise ValueError("plus de %d lignes d'en-tête" % MAX_ENTETES)
+
+    async def route(self, méthode: str, chemin: str, corps: bytes) -> tuple:
+        """ Renvoie le statut HTTP et le dictionnaire de réponse
+        """
+        if chemin == '/metriques':
+            if méthode != 'GET':
+                return 405, {'erreur': 'GET attendu'}
+            return 200, self.mesures.résumé(self.file.qsize())
+        if chemin != '/plsc':
+            return 404, {'erreur': 'chemin inconnu'}
+        if méthode != 'POST':
+            return 405, {'erreur': 'POST attendu'}
+        try:
+            données = json.loads(corps)
+        except ValueError:
+            self.mesures.erreurs += 1
+            return 400, {'erreur': 'JSON invalide'}
+        erreur = valide_requête(données)
+        if erreur is not None:
+            self.mesures.erreurs += 1
+            return 400, {'erreur': erreur}
+        if len(données['x']) * len(données['y']) > self.taille_max_tableau:
+            self.mesures.erreurs += 1
+            return 413, {'erreur': 'tableau trop grand (len(x)*len(y) > %d)'
+                                   % self.taille_max_tableau}
+        données.setdefault('requete', 'plsc')
+        réponse = await self.soumets(données)
+        if réponse is None:
+            self.mesures.rejets += 1
+            return 503, {'erreur': 'serveur saturé'}
+        if 'erreur' in réponse:
+            self.mesures.erreurs += 1
+            return réponse.pop('statut', 400), réponse
+        return 200, réponse
+
+    async def répond(self, écrivain, statut: int, réponse: dict, garder: bool):
+        """ Écrit la réponse HTTP (corps JSON)
+        """
+        corps = json.dumps(réponse, ensure_ascii=False).encode('utf-8')
+        entêtes = ('HTTP/1.1 %d %s\r\n' % (statut, RAISONS[statut]) +
+                   'Content-Type: application/json; charset=utf-8\r\n' +
+                   'Content-Length: %d\r\n' % len(corps) +
+                   ('Retry-After: 1\r\n' if statut == 503 else '') +
+                   'Connection: %s\r\n\r\n' % ('keep-alive' if garder else 'close'))
+        écrivain.write(entêtes.encode('latin-1') + corps)
+        await écrivain.drain()
+
+
+async def sert(serveur: ServeurPLSC):
+    """ Lance le serveur jusqu'à son interruption
+    """
+    port = await serveur.démarre()
+    print("Service PLSC sur http://%s:%d" % (serveur.hôte, port))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await serveur.arrête()
+
+
+# ********** Corps du programme **********
+if __name__ == '__main__':
+    analyseur = argparse.ArgumentParser(description="Service HTTP/JSON de recherche de PLSC")
+    analyseur.add_argument('--hote', default='127.0.0.1')
+    analyseur.add_argument('--port', type=int, default=8765)
+    analyseur.add_argument('--processus', type=int, default=None)
+    analyseur.add_argument('--taille-lot', type=int, default=32)
+    analyseur.add_argument('--delai-lot', type=float, default=0.005,
+                           help="Attente maximale (s) pour compléter un lot")
+    analyseur.add_argument('--max-en-attente', type=int, default=256)
+    analyseur.add_argument('--taille-max-tableau', type=int, default=1000000,
+                           help="Nombre maximal de cases len(x)*len(y) par requête")
+    args = analyseur.parse_args()
+    try:
+        asyncio.run(sert(ServeurPLSC(args.hote, args.port, args.processus,
+                                     args.taille_lot, args.delai_lot,
+                                     args.max_en_attente,
+                                     taille_max_tableau=args.taille_max_tableau)))
+    except KeyboardInterrupt:
+        pass
@@ -5,6 +5,70 @@ PLSC: Recherhche d'une Plus longue sous-séquence commune entre 2 chaînes
 Eric Buonocore. Le 06/06/2021
 """
 
+# ********** Bibliothèques **********
+from array import array  # Stockage compact des chemins
+from collections import deque
+
+
+# ********** Fonctions **********
+def indices_dominés(points: list, entrées: list) -> list:
+    """ Renvoie, dans l'ordre, les indices des points (x, y) pour lesquels il
+    existe une entrée (i, j) vérifiant x <= i et y <= j
+    """
+    if not entrées:
+        return []
+    # Entrées par abscisses décroissantes et ordonnée maximale atteinte
+    entrées = sorted(entrées, reverse=True)
+    abscisses = [i for i, _ in entrées]
+    maximums = []
+    for _, j in entrées:
+        maximums.append(max(j, maximums[-1]) if maximums else j)
+    indices = []
+    for n, (x, y) in enumerate(points):
+        # Nombre d'entrées d'abscisse >= x (recherche dichotomique)
+        bas, haut = 0, len(abscisses)
+        while bas < haut:
+            milieu = (bas + haut) // 2
+            if abscisses[milieu] >= x:
+                bas = milieu + 1
+            else:
+                haut = milieu
+        if bas > 0 and maximums[bas-1] >= y:
+            indices.append(n)
+    return indices
+
+
+def sommes_dominées(points: list, poids: list, entrées: list) -> list:
+    """ Pour chaque entrée (i, j), renvoie la somme des poids des points
+    (x, y) vérifiant x <= i et y <= j.
+    Balayage par abscisses croissantes et arbre de Fenwick sur les ordonnées:
+    O((len(points) + len(entrées)) * log)
+    """
+    taille = max([y for _, y in points] + [j for _, j in entrées] + [0]) + 2
+    fenwick = [0] * taille
+    ordre_points = sorted(range(len(points)), key=lambda n: points[n][0])
+    ordre_entrées = sorted(range(len(entrées)), key=lambda n: entrées[n][0])
+    sommes = [0] * len(entrées)
+    n_point = 0
+    for n in ordre_entrées:
+        i, j = entrées[n]
+        # Ajoute les points d'abscisse <= i
+        while n_point < len(ordre_points) and points[ordre_points[n_point]][0] <= i:
+            indice = points[ordre_points[n_point]][1] + 1
+            while indice < taille:
+                fenwick[indice] += poids[ordre_points[n_point]]
+                indice += indice & -indice
+            n_point += 1
+        # Somme des poids d'ordonnée <= j
+        indice = min(j + 1, taille - 1)
+        total = 0
+        while indice > 0:
+            total += fenwick[indice]
+            indice -= indice & -indice
+        sommes[n] = total
+    return sommes
+
+
 # ********** Classes **********
 class ResoPLSC:
     """ Modélisation de la résolution de la recherche d'une PLSC
@@ -18,73 +82,377 @@ class ResoPLSC:
         self.tableau = [[]]
         # Agrégateur des cases. Format: (label,(x,y), indice_couleur)
         self.cases = cases
+        # Index des cases: (x, y) -> case
+        self.index_cases = {(case.x, case.y): case for case in reversed(cases)}
         # Agrégateur des flèches: tableau à 2 dimension. Contient le type de flèche
         self.flèches = []
         # [[liste des ponts de valeur 0], ...[liste des ponts de valeur max(m,n)]]
         self.ponts = []
         self.chemin = None  # Description du bactracking à dessiner en pointillés
         # Format d'une ligne: ((x1, y1),(x2, y2))
-        self.chemins =  []  # Liste des chemins possibles
+        self.chemins = ArbreChemins()  # Chemins possibles
         self.couleurs = {'neutre': (200, 200, 200), 'base': (80, 80, 255),
                          'alerte': (224, 0, 0),  'message': (230, 230, 0),
                          'actif': (0, 192, 0)}
 
-    def backtracking_mem(self, i:int, j:int, valeur:int, branches:list)->list:
-        """ Initialise le dictionnaire de mémoïsation et lance la retour sur
-        trace récursif.
-        """
-        dicto_memo = dict()
-        def backtracking_rec(i:int, j:int, valeur:int, branches:list)->list:
-            """ A partir du tableau des recherches partielles et de X et Y
-            retrouve récursivement tous chemins menant aux PLSC
-            Renvoie la liste des différents chemins : Liste de listes de tuples
-            (i,j) est le point de départ du pont précédent, valeur est la
-            valeur de cette case.
-            """
-            if (i, j) in dicto_memo:
-                return dicto_memo[(i, j)]
-            # Cas de base: Plus de pont à ce niveau, renvoie une liste de liste vide
+    def backtracking_arbre(self, i: int, j: int, valeur: int) -> 'ArbreChemins':
+        """ A partir du tableau des recherches partielles et de X et Y
+        retrouve tous chemins menant aux PLSC.
+        (i,j) est le point de départ, valeur est la valeur de cette case.
+        Renvoie un ArbreChemins: les chemins partageant un même début n'y sont
+        stockés qu'une fois. Chaque chemin commence par (i+1, j+1) puis liste
+        les ponts par valeurs décroissantes.
+        """
+        arbre = ArbreChemins()
+        # Parcours en profondeur itératif: (nœud parent, i, j, valeur)
+        pile = [(-1, i, j, valeur)]
+        while pile:
+            parent, i, j, valeur = pile.pop()
+            nœud = arbre.ajoute_nœud(parent, i+1, j+1)
+            # Cas de base: Plus de pont à ce niveau, le chemin est complet
             if valeur == 0:
-                return [[(i+1, j+1)]]
-            # Initialise la liste des chemins
-            pistes = []
-            # Test les ponts valides depuis ce point d'entrée (i,j)
-            for pont in self.ponts[valeur]:
+                arbre.feuilles.append(nœud)
+                continue
+            # Ponts valides depuis ce point d'entrée (i,j), empilés en ordre
+            # inverse pour être parcourus dans l'ordre de self.ponts
+            valides = [pont for pont in self.ponts[valeur]
+                       if pont[0] <= i and pont[1] <= j]
+            for pont in reversed(valides):
+                pile.append((nœud, pont[0]-1, pont[1]-1, valeur-1))
+        return arbre
+
+    def initialise_tableau(self):
+        """ Crée le tableau des valeurs (m*n) cases, initialisé à 0, et le
+        tableau des ponts (cases (i, j) vérifiant X[i] = Y[j]) à partir de X et Y
+        """
+        m = len(self.X)
+        n = len(self.Y)
+        self.tableau = [[0]*(m) for _ in range(n)]
+        # La PLSC est forcement plus petite que la plus petite sequence
+        self.ponts = [[] for _ in range(min(m, n))]
+
+    def parcours_tableau(self):
+        """ Générateur: remplit le tableau des recherches partielles et les
+        ponts dans le sens de lecture (gauche/droite, haut/bas).
+        Après chaque case, fournit (ligne, colonne, pont), pont indiquant si
+        X[colonne] = Y[ligne]
+        """
+        for ligne in range(1, len(self.Y)):
+            for colonne in range(1, len(self.X)):
+                if self.X[colonne] == self.Y[ligne]:
+                    valeur = self.tableau[ligne-1][colonne-1] + 1
+                    self.tableau[ligne][colonne] = valeur
+                    self.ponts[valeur].append((colonne, ligne))
+                    yield ligne, colonne, True
+                else:
+                    haut = self.tableau[ligne-1][colonne]
+                    gauche = self.tableau[ligne][colonne-1]
+                    self.tableau[ligne][colonne] = max(haut, gauche)
+                    yield ligne, colonne, False
+
+    def calcule_tableau(self, sequence1, sequence2) -> int:
+        """ Résolution sans interface graphique: construit X, Y, le tableau des
+        recherches partielles et les ponts, comme la fenêtre.
+        Renvoie la longueur de la PLSC.
+        """
+        self.X = [''] + list(sequence1)
+        self.Y = [''] + list(sequence2)
+        self.initialise_tableau()
+        for _ in self.parcours_tableau():
+            pass
+        return self.tableau[-1][-1]
+
+    def compte_ponts(self, i: int, j: int, valeur: int) -> list:
+        """ Pour chaque pont atteignable depuis (i, j), compte les chemins qui
+        le relient à un pont de valeur 1 (0 pour les ponts non atteignables).
+        Calcul itératif: une descente par valeurs décroissantes repère les
+        ponts atteignables, puis le nombre associé à un pont (c, l) de valeur v
+        est la somme des nombres des ponts de valeur v-1 situés en haut à
+        gauche de (c-1, l-1), par valeurs croissantes.
+        Renvoie une liste alignée sur self.ponts: nombres[v][n] pour self.ponts[v][n]
+        """
+        nombres = [[0] * len(ponts_valeur) for ponts_valeur in self.ponts]
+        # Indices des ponts atteignables, par valeur
+        utiles = [[] for _ in range(valeur+1)]
+        entrées = [(i, j)]
+        for v in range(valeur, 0, -1):
+            utiles[v] = indices_dominés(self.ponts[v], entrées)
+            entrées = [(self.ponts[v][n][0]-1, self.ponts[v][n][1]-1) for n in utiles[v]]
+        if valeur >= 1:
+            for n in utiles[1]:
+                nombres[1][n] = 1
+        for v in range(2, valeur+1):
+            entrées = [(self.ponts[v][n][0]-1, self.ponts[v][n][1]-1) for n in utiles[v]]
+            sommes = sommes_dominées([self.ponts[v-1][n] for n in utiles[v-1]],
+                                     [nombres[v-1][n] for n in utiles[v-1]],
+                                     entrées)
+            for n, somme in zip(utiles[v], sommes):
+                nombres[v][n] = somme
+        return nombres
+
+    def compte_chemins(self, i: int, j: int, valeur: int, nombres=None) -> int:
+        """ Compte, sans les construire, les chemins que renverrait
+        backtracking_arbre(i, j, valeur)
+        nombres: résultat de compte_ponts(i, j, valeur), calculé s'il n'est pas fourni
+        """
+        if valeur == 0:
+            return 1
+        if nombres is None:
+            nombres = self.compte_ponts(i, j, valeur)
+        return sum(nombre for pont, nombre in zip(self.ponts[valeur], nombres[valeur])
+                   if pont[0] <= i and pont[1] <= j)
+
+    def chemin_numéro(self, k: int) -> list:
+        """ Renvoie le chemin d'indice k dans l'ordre de backtracking_arbre sans
+        construire la liste de tous les chemins (calcule_tableau doit avoir été
+        appelé). Renvoie None si k est hors limites.
+        """
+        i = len(self.X) - 1
+        j = len(self.Y) - 1
+        valeur = self.tableau[j][i]
+        nombres = self.compte_ponts(i, j, valeur)
+        if k < 0 or k >= self.compte_chemins(i, j, valeur, nombres):
+            return None
+        chemin = [(i+1, j+1)]
+        # Descend niveau par niveau en sautant les branches de rang inférieur à k
+        while valeur > 0:
+            for pont, nombre in zip(self.ponts[valeur], nombres[valeur]):
                 if pont[0] <= i and pont[1] <= j:
-                    # Pour chaque pont valide, récupère la liste des chemins possibles
-                    branches = backtracking_rec(pont[0]-1, pont[1]-1,
-                                                valeur-1, branches)
-                    # Reconstruit une liste unique de tous les chemins possibles
-                    # précédés par le pont
-                    for branche in branches:
-                        pistes.append([(i+1, j+1)] + branche)
-            dicto_memo[(i, j)] = pistes
-            return pistes
-        return backtracking_rec(i, j, valeur, branches)
+                    if k < nombre:
+                        break
+                    k -= nombre
+            i, j, valeur = pont[0]-1, pont[1]-1, valeur-1
+            chemin.append((i+1, j+1))
+        return chemin
+
+    def chemin_direct(self) -> list:
+        """ Renvoie le chemin d'une PLSC (même format que chemin_numéro) par
+        retour sur trace itératif dans le tableau (calcule_tableau doit avoir
+        été appelé), sans compter les chemins: O(len(X) + len(Y))
+        """
+        colonne = len(self.X) - 1
+        ligne = len(self.Y) - 1
+        chemin = [(colonne+1, ligne+1)]
+        while colonne > 0 and ligne > 0:
+            if self.X[colonne] == self.Y[ligne]:
+                chemin.append((colonne, ligne))
+                colonne -= 1
+                ligne -= 1
+            elif self.tableau[ligne-1][colonne] >= self.tableau[ligne][colonne-1]:
+                ligne -= 1
+            else:
+                colonne -= 1
+        return chemin
+
+    def une_plsc(self) -> list:
+        """ Renvoie les symboles d'une PLSC, lus sur chemin_direct()
+        """
+        return [self.X[case[0]] for case in reversed(self.chemin_direct()[1:])]
+
+    def chaîne_du_chemin(self, chemin: list) -> str:
+        """ Renvoie la chaîne correspondante à un chemin (liste de tuples)
+        """
+        # Le chemin est parcouru de la fin vers le début des séquences
+        return "".join(self.X[case[0]] for case in reversed(chemin[1:]))
 
     def  chemin_vers_chaîne(self, chemin_sélection):
-        """ Renvoie la chaîne correspondante à un chemin
+        """ Renvoie la chaîne correspondante à un chemin de self.chemins
         """
         if chemin_sélection>=len(self.chemins):
             return ""
-        chaînePlsc = ""
-        # La première coordonnée du chemin correspond au point (len(self.X), len(self.Y))
+        # La racine de l'arbre correspond au point (len(self.X), len(self.Y))
         # hors du tableau: On n'en tient pas compte dans la résolution du problème
-        chemin = self.chemins[chemin_sélection][1:]
-        for case in chemin:
-            caractère = self.X[case[0]]
-            chaînePlsc = caractère + chaînePlsc
-        return chaînePlsc
+        # Remonter de la feuille à la racine donne les caractères dans l'ordre
+        arbre = self.chemins
+        nœud = arbre.feuilles[chemin_sélection]
+        caractères = []
+        while arbre.parents[nœud] != -1:
+            caractères.append(self.X[arbre.abscisses[nœud]])
+            nœud = arbre.parents[nœud]
+        return "".join(caractères)
+
+    def segments_chemin(self, chemin_sélection: int) -> list:
+        """ Renvoie les segments ((x1, y1),(x2, y2)) du tracé en pointillés
+        du chemin d'indice chemin_sélection (trois segments par pont)
+        """
+        segments = []
+        point_origine = (len(self.X)-1, len(self.Y)-1)
+        for x, y in self.chemins[chemin_sélection][1:]:
+            segments.append((point_origine, (x, point_origine[1])))
+            segments.append(((x, point_origine[1]), (x, y)))
+            segments.append(((x, y), (x-1, y-1)))
+            point_origine = (x-1, y-1)
+        return segments
+
+    def ajoute_case(self, case: 'Cases'):
+        """ Ajoute une case au tableau et l'indexe par ses coordonnées
+        """
+        self.cases.append(case)
+        # En cas de doublon, cherche_case renvoie la première case ajoutée
+        self.index_cases.setdefault((case.x, case.y), case)
+
+    def efface_cases(self):
+        """ Supprime toutes les cases
+        """
+        self.cases = []
+        self.index_cases = {}
 
     def cherche_case(self, x: int, y: int):
-        """ Parcours toutes les cases à la recherche de la case d'abscisse x
-        et d'ordonnée y
+        """ Renvoie la case d'abscisse x et d'ordonnée y
         Renvoie None s'il ne la trouve pas.
         """
-        for case in self.cases:
-            if case.x == x and case.y == y:
-                return case
-        return None
+        return self.index_cases.get((x, y))
+
+
+class ArbreChemins:
+    """ Stockage compact des chemins menant aux PLSC: arbre des préfixes
+    communs (pointeurs vers le parent). Un nœud par point (i, j) distinct
+    d'un début de chemin; un chemin est désigné par sa feuille.
+    Attributs: tableaux parents, abscisses, ordonnées (indexés par nœud),
+    feuilles (nœud final de chaque chemin)
+    """
+
+    def __init__(self):
+        self.parents = array('i')  # -1 pour la racine
+        self.abscisses = array('i')
+        self.ordonnées = array('i')
+        self.feuilles = array('i')
+
+    def __len__(self):
+        return len(self.feuilles)
+
+    def __getitem__(self, k: int) -> list:
+        """ Renvoie le chemin d'indice k sous forme de liste de tuples (i, j)
+        """
+        return [(self.abscisses[nœud], self.ordonnées[nœud])
+                for nœud in self.nœuds(k)]
+
+    def ajoute_nœud(self, parent: int, i: int, j: int) -> int:
+        """ Ajoute le point (i, j) à la suite du nœud parent (-1: racine)
+        Renvoie le numéro du nouveau nœud
+        """
+        self.parents.append(parent)
+        self.abscisses.append(i)
+        self.ordonnées.append(j)
+        return len(self.parents) - 1
+
+    def nœuds(self, k: int) -> list:
+        """ Renvoie la liste des nœuds du chemin d'indice k, de la racine
+        à la feuille
+        """
+        nœud = self.feuilles[k]
+        nœuds = []
+        while nœud != -1:
+            nœuds.append(nœud)
+            nœud = self.parents[nœud]
+        nœuds.reverse()
+        return nœuds
+
+    def différence(self, ancien: int, nouveau: int) -> tuple:
+        """ Renvoie les points (i, j) propres à chacun des deux chemins:
+        (points quittés, points atteints). Les débuts communs ne sont pas
+        parcourus au-delà du premier nœud commun.
+        """
+        quittés = []
+        atteints = []
+        nœud_ancien = self.feuilles[ancien]
+        nœud_nouveau = self.feuilles[nouveau]
+        # Tous les chemins ont la même longueur: on remonte en parallèle
+        while nœud_ancien != nœud_nouveau:
+            quittés.append((self.abscisses[nœud_ancien], self.ordonnées[nœud_ancien]))
+            atteints.append((self.abscisses[nœud_nouveau], self.ordonnées[nœud_nouveau]))
+            nœud_ancien = self.parents[nœud_ancien]
+            nœud_nouveau = self.parents[nœud_nouveau]
+        return quittés, atteints
+
+
+class PLSCGlissante:
+    """ Recherche de la PLSC entre une séquence fixe X et une fenêtre glissante
+    sur un flux de symboles (ajout du plus récent, retrait du plus ancien).
+    LCS semi-locale par peignage des "algues" (seaweeds, A. Tiskin): chaque
+    colonne du flux n'est peignée qu'une fois, en O(len(X)); le retrait d'un
+    symbole est en O(1). Pour la fenêtre [début, fin) du flux:
+    longueur = (fin - début) - nombre d'algues parties du haut d'une colonne
+    de la fenêtre et déjà sorties par le bas.
+    Si largeur est renseignée, ajoute() retire automatiquement les symboles
+    au-delà des largeur plus récents.
+    """
+
+    def __init__(self, x, largeur=None):
+        if largeur is not None and largeur < 1:
+            raise ValueError("largeur doit être au moins 1")
+        self.X = x
+        self.largeur = largeur
+        # Algue horizontale présente sur chaque ligne de X. Etiquettes:
+        # -(i+1) pour l'algue entrée à gauche de la ligne i, t pour l'algue
+        # entrée en haut de la colonne t du flux
+        self.horizontales = [-(i+1) for i in range(len(x))]
+        self.fenêtre = deque()  # Symboles de la fenêtre, du plus ancien au plus récent
+        self.début = 0  # Indice dans le flux du plus ancien symbole de la fenêtre
+        # Colonnes de la fenêtre dont l'algue est déjà sortie par le bas
+        self.sorties = set()
+
+    def ajoute(self, symbole) -> int:
+        """ Ajoute le symbole le plus récent du flux
+        Renvoie la longueur de la PLSC de la fenêtre
+        """
+        verticale = self.début + len(self.fenêtre)
+        h = self.horizontales
+        for i, caractère in enumerate(self.X):
+            # Les algues se croisent au plus une fois et jamais sur un pont
+            if caractère == symbole or h[i] > verticale:
+                h[i], verticale = verticale, h[i]
+        self.fenêtre.append(symbole)
+        if verticale >= self.début:
+            self.sorties.add(verticale)
+        if self.largeur is not None and len(self.fenêtre) > self.largeur:
+            self.retire()
+        return self.longueur()
+
+    def retire(self) -> int:
+        """ Retire le symbole le plus ancien de la fenêtre
+        Renvoie la longueur de la PLSC de la fenêtre
+        """
+        if not self.fenêtre:
+            raise ValueError("la fenêtre est vide")
+        self.fenêtre.popleft()
+        self.sorties.discard(self.début)
+        self.début += 1
+        return self.longueur()
+
+    def longueur(self) -> int:
+        """ Renvoie la longueur de la PLSC de X et de la fenêtre
+        """
+        return len(self.fenêtre) - len(self.sorties)
+
+    def plsc(self):
+        """ Renvoie une PLSC de X et de la fenêtre (chaîne si X est une chaîne,
+        liste de symboles sinon). Non incrémental: le tableau de X et de la
+        fenêtre est recalculé, en O(len(X)*len(fenêtre)), puis parcouru par
+        retour sur trace direct
+        """
+        T = ResoPLSC()
+        T.calcule_tableau(self.X, self.fenêtre)
+        symboles = T.une_plsc()
+        if isinstance(self.X, str):
+            return "".join(symboles)
+        return symboles
+
+
+def plsc_glissante(x, flux, largeur: int, avec_plsc=False):
+    """ Générateur: pour chaque symbole du flux, fournit la longueur de la PLSC
+    de x et des largeur derniers symboles, ou le couple (longueur, PLSC)
+    si avec_plsc est vrai.
+    Coût par symbole: O(len(x)) pour la longueur seule; avec_plsc ajoute
+    O(len(x)*largeur) (PLSC recalculée sur la fenêtre à chaque symbole)
+    """
+    recherche = PLSCGlissante(x, largeur)
+    for symbole in flux:
+        longueur = recherche.ajoute(symbole)
+        if avec_plsc:
+            yield longueur, recherche.plsc()
+        else:
+            yield longueur
 
 
 class Cases:
@@ -0,0 +1,76 @@
+# coding: utf-8
+"""
+Vérification hors écran du dessin partiel de la fenêtre (QPlscFenetres.py)
+Ignorée si qtpy ou une liaison Qt n'est pas installé.
+Lancement: python test_QPlscFenetres.py   (ou python -m pytest)
+"""
+
+# ********** Bibliothèques **********
+import os
+import sys
+import unittest
+try:
+    from qtpy.QtWidgets import QApplication
+    from qtpy.QtGui import QPainter
+    QT_DISPONIBLE = True
+except (ImportError, RuntimeError):
+    QT_DISPONIBLE = False
+
+
+# ********** Classes **********
+@unittest.skipUnless(QT_DISPONIBLE, "qtpy ou liaison Qt absent")
+class TestDessinPartiel(unittest.TestCase):
+    """ Le changement de solution ne redessine, dans la dernière image, que
+    la région modifiée: le résultat doit être celui d'un dessin complet
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Pas d'écran disponible: Qt dessine hors écran
+        if not os.environ.get('DISPLAY') and sys.platform.startswith('linux'):
+            os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+        from QPlscFenetres import Fenetre
+        cls.frame = Fenetre()
+
+    def dessin_complet(self):
+        """ Renvoie l'image du tableau entièrement redessiné
+        """
+        image = self.frame.images[0].copy()
+        p = QPainter()
+        p.begin(image)
+        self.frame.dessin.dessine_tableau(p)
+        p.end()
+        return image
+
+    def test_changement_de_solution(self):
+        frame = self.frame
+        frame.spinCompletion.setValue(0)
+        # Echelle lisible, puis minuscule (les cases voisines se chevauchent)
+        for taille, toutes, sequence1, sequence2 in (
+                ((600, 500), True, 'ABCBDAB', 'BDCABA'),
+                ((600, 500), False, 'ABCBDAB', 'BDCABA'),
+                ((600, 500), True, 'aabbaabb', 'abababab'),
+                ((100, 30), True, 'ABCBDAB', 'BDCABA'),
+                ((100, 30), True, 'aabbaabb', 'abababab'),
+                ((100, 30), False, 'aabbaabb', 'abababab')):
+            frame.dessin.resize(*taille)
+            frame.seq1.setPlainText(sequence1)
+            frame.seq2.setPlainText(sequence2)
+            frame.boxSelectionToutesPlsc.setChecked(toutes)
+            frame.recherche_plsc()
+            nombre = len(frame.dessin.reso.chemins)
+            self.assertGreater(nombre, 1)
+            nombre_images = len(frame.images)
+            for k in list(range(1, nombre)) + [0, nombre-1, 0]:
+                frame.spinSelectionPlsc.setValue(k)
+                self.assertEqual(frame.chemin_affiché, k)
+                # Pas de nouvelle image: la dernière est mise à jour
+                self.assertEqual(len(frame.images), nombre_images)
+                self.assertTrue(frame.images[-1] == self.dessin_complet(),
+                                (taille, toutes, sequence1, sequence2, k))
+
+
+# ********** Corps du programme **********
+if __name__ == '__main__':
+    unittest.main()
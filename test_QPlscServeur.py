@@ -0,0 +1,182 @@
+# coding: utf-8
+"""
+Vérification du service PLSC sur localhost (QPlscServeur.py)
+Lancement: python test_QPlscServeur.py   (ou python -m pytest)
+"""
+
+# ********** Bibliothèques **********
+import asyncio
+import json
+import time
+import unittest
+# Creation de la classe ServeurPLSC
+from QPlscServeur import MAX_ENTETES, ServeurPLSC, résous_lot
+
+
+async def envoie_brut(port: int, requête: bytes) -> tuple:
+    """ Envoie une requête HTTP déjà formée au serveur local
+    Renvoie le statut et le corps JSON décodé
+    """
+    lecteur, écrivain = await asyncio.open_connection('127.0.0.1', port)
+    écrivain.write(requête)
+    réponse = await lecteur.read()
+    écrivain.close()
+    entêtes, _, données = réponse.partition(b'\r\n\r\n')
+    return int(entêtes.split(b' ')[1]), json.loads(données)
+
+
+async def envoie(port: int, méthode: str, chemin: str, corps=b'') -> tuple:
+    """ Envoie une requête HTTP au serveur local
+    Renvoie le statut et le corps JSON décodé
+    """
+    return await envoie_brut(port, ('%s %s HTTP/1.1\r\nContent-Length: %d\r\n'
+                                    'Connection: close\r\n\r\n'
+                                    % (méthode, chemin, len(corps))).encode('latin-1') + corps)
+
+
+async def demande(port: int, requête: dict) -> tuple:
+    return await envoie(port, 'POST', '/plsc', json.dumps(requête).encode('utf-8'))
+
+
+# ********** Classes **********
+class TestServeurPLSC(unittest.IsolatedAsyncioTestCase):
+    """ Démarre un serveur sur un port libre de localhost pour chaque test
+    """
+
+    async def asyncSetUp(self):
+        self.serveur = ServeurPLSC(port=0, processus=1, taille_lot=1, max_en_attente=1)
+        self.port = await self.serveur.démarre()
+
+    async def asyncTearDown(self):
+        await self.serveur.arrête()
+
+    async def attend(self, condition, délai=5.0):
+        """ Attend, au plus délai secondes, que condition() soit vraie
+        """
+        fin = time.monotonic() + délai
+        while not condition():
+            self.assertLess(time.monotonic(), fin, "délai d'attente dépassé")
+            await asyncio.sleep(0.01)
+
+    def note_dépôts(self) -> list:
+        """ Renvoie la liste, tenue à jour, des éléments placés dans la file
+        """
+        dépôts = []
+        dépose = self.serveur.file.put_nowait
+        def note(élément):
+            dépose(élément)
+            dépôts.append(élément)
+        self.serveur.file.put_nowait = note
+        return dépôts
+
+    async def test_requêtes(self):
+        x, y = 'ABCBDAB', 'BDCABA'
+        statut, réponse = await demande(self.port, {'x': x, 'y': y, 'requete': 'longueur'})
+        self.assertEqual((statut, réponse), (200, {'longueur': 4}))
+        statut, réponse = await demande(self.port, {'x': x, 'y': y, 'requete': 'nombre'})
+        self.assertEqual((statut, réponse['nombre']), (200, 4))
+        statut, réponse = await demande(self.port, {'x': x, 'y': y, 'requete': 'plsc'})
+        self.assertEqual(statut, 200)
+        self.assertEqual(réponse, {'longueur': 4, 'plsc': 'BDAB',
+                                   'positions': [[3, 0], [4, 1], [5, 3], [6, 4]]})
+        statut, réponse = await demande(self.port, {'x': x, 'y': y, 'requete': 'kieme', 'k': 3})
+        self.assertEqual((statut, réponse['plsc']), (200, 'BCBA'))
+        self.assertEqual(réponse['positions'], [[1, 0], [2, 2], [3, 4], [5, 5]])
+        statut, réponse = await demande(self.port, {'x': x, 'y': y, 'requete': 'kieme', 'k': 4})
+        self.assertEqual((statut, réponse), (400, {'erreur': 'k hors limites'}))
+
+    async def test_longue_plsc(self):
+        statut, réponse = await demande(self.port, {'x': 'a'*600, 'y': 'a'*600})
+        self.assertEqual((statut, réponse['plsc']), (200, 'a'*600))
+
+    async def test_requêtes_invalides(self):
+        statut, réponse = await envoie(self.port, 'POST', '/plsc', b'{"x": ')
+        self.assertEqual((statut, réponse), (400, {'erreur': 'JSON invalide'}))
+        statut, _ = await demande(self.port, {'x': 'ab', 'y': 3})
+        self.assertEqual(statut, 400)
+        statut, _ = await demande(self.port, {'x': 'a'*2000, 'y': 'a'*2000})
+        self.assertEqual(statut, 413)
+
+    async def test_entêtes_trop_longs(self):
+        # Lignes plus longues que la limite du lecteur (64 Kio)
+        statut, _ = await envoie_brut(self.port, b'GET /' + b'a'*70000 + b' HTTP/1.1\r\n\r\n')
+        self.assertEqual(statut, 400)
+        statut, _ = await envoie_brut(self.port, b'GET /metriques HTTP/1.1\r\nX: '
+                                      + b'a'*70000 + b'\r\n\r\n')
+        self.assertEqual(statut, 431)
+        statut, _ = await envoie_brut(self.port, b'GET /metriques HTTP/1.1\r\n'
+                                      + b'X: a\r\n' * (MAX_ENTETES + 1) + b'\r\n')
+        self.assertEqual(statut, 431)
+        statut, _ = await envoie_brut(self.port, b'GET /metriques HTTP/1.1\r\n'
+                                      + b'X: a\r\n' * (MAX_ENTETES - 1)
+                                      + b'Connection: close\r\n\r\n')
+        self.assertEqual(statut, 200)
+
+    async def test_file_pleine(self):
+        # Bloque la résolution des lots: la première requête est retenue par la
+        # constitution des lots, la deuxième remplit la file, la troisième est rejetée
+        await self.serveur.lots_en_cours.acquire()
+        dépôts = self.note_dépôts()
+        requête = {'x': 'ab', 'y': 'ba', 'requete': 'longueur'}
+        premières = [asyncio.create_task(demande(self.port, requête))]
+        # Attend que la constitution des lots retire la première requête de la file
+        await self.attend(lambda: dépôts and self.serveur.file.empty())
+        premières.append(asyncio.create_task(demande(self.port, requête)))
+        await self.attend(lambda: not self.serveur.file.empty())
+        statut, réponse = await demande(self.port, requête)
+        self.assertEqual((statut, réponse), (503, {'erreur': 'serveur saturé'}))
+        self.serveur.lots_en_cours.release()
+        for statut, _ in await asyncio.gather(*premières):
+            self.assertEqual(statut, 200)
+
+    async def test_arrêt(self):
+        # Les requêtes retenues par la constitution des lots ou restées dans la
+        # file reçoivent une réponse à l'arrêt du serveur
+        await self.serveur.lots_en_cours.acquire()
+        dépôts = self.note_dépôts()
+        requête = {'x': 'ab', 'y': 'ba', 'requete': 'longueur'}
+        en_attente = [asyncio.create_task(demande(self.port, requête))]
+        await self.attend(lambda: dépôts and self.serveur.file.empty())
+        en_attente.append(asyncio.create_task(demande(self.port, requête)))
+        await self.attend(lambda: not self.serveur.file.empty())
+        await self.serveur.arrête()
+        for statut, réponse in await asyncio.gather(*en_attente):
+            self.assertEqual((statut, réponse), (503, {'erreur': 'serveur arrêté'}))
+
+    async def test_arrêt_keep_alive(self):
+        # Une connexion keep-alive inactive est fermée par l'arrêt du serveur
+        lecteur, écrivain = await asyncio.open_connection('127.0.0.1', self.port)
+        écrivain.write(b'GET /metriques HTTP/1.1\r\n\r\n')
+        entêtes = await lecteur.readuntil(b'\r\n\r\n')
+        self.assertIn(b'Connection: keep-alive', entêtes)
+        await self.serveur.arrête()
+        self.assertEqual(self.serveur.connexions, {})
+        await asyncio.wait_for(lecteur.read(), 5)
+        self.assertTrue(lecteur.at_eof())
+        écrivain.close()
+
+    async def test_metriques(self):
+        await demande(self.port, {'x': 'ab', 'y': 'ba', 'requete': 'longueur'})
+        await envoie(self.port, 'POST', '/plsc', b'?')
+        statut, mesures = await envoie(self.port, 'GET', '/metriques')
+        self.assertEqual(statut, 200)
+        self.assertEqual((mesures['requetes'], mesures['erreurs'], mesures['lots']), (1, 1, 1))
+        self.assertGreater(mesures['latence_ms']['max'], 0)
+
+
+class TestRésousLot(unittest.TestCase):
+    """ Résolution d'un lot dans le processus courant
+    """
+
+    def test_erreur_isolée(self):
+        # Une requête qui lève une exception n'affecte pas les autres du lot
+        réponses = résous_lot([{'x': 'ab', 'requete': 'longueur'},
+                               {'x': 'ab', 'y': 'ba', 'requete': 'longueur'}])
+        self.assertEqual(réponses, [{'erreur': 'KeyError', 'statut': 500},
+                                    {'longueur': 1}])
+
+
+# ********** Corps du programme **********
+# Protection nécessaire: les processus 'spawn' du serveur réimportent ce module
+if __name__ == '__main__':
+    unittest.main()
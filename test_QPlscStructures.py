@@ -0,0 +1,172 @@
+# coding: utf-8
+"""
+Vérification des structures de résolution sans interface (QPlscStructures.py)
+Lancement: python test_QPlscStructures.py   (ou python -m pytest)
+"""
+
+# ********** Bibliothèques **********
+import itertools
+import random
+import unittest
+# Creation des classes ResoPLSC, PLSCGlissante et de plsc_glissante
+from QPlscStructures import ResoPLSC, PLSCGlissante, plsc_glissante
+
+
+def chemins_référence(T: ResoPLSC, i: int, j: int, valeur: int) -> list:
+    """ Énumération récursive directe des chemins, dans l'ordre de T.ponts
+    """
+    if valeur == 0:
+        return [[(i+1, j+1)]]
+    return [[(i+1, j+1)] + suite
+            for pont in T.ponts[valeur] if pont[0] <= i and pont[1] <= j
+            for suite in chemins_référence(T, pont[0]-1, pont[1]-1, valeur-1)]
+
+
+def longueur_référence(x, y) -> int:
+    """ Longueur de la PLSC de x et y par le tableau complet
+    """
+    return ResoPLSC().calcule_tableau(x, list(y))
+
+
+def est_sous_séquence(s, t) -> bool:
+    """ Indique si s est une sous-séquence de t
+    """
+    reste = iter(t)
+    return all(symbole in reste for symbole in s)
+
+
+def plsc_force_brute(x: str, y: str) -> set:
+    """ Ensemble des PLSC de x et y par essai de toutes les sous-séquences de x
+    """
+    for longueur in range(min(len(x), len(y)), -1, -1):
+        plsc = {"".join(x[n] for n in indices)
+                for indices in itertools.combinations(range(len(x)), longueur)}
+        plsc = {s for s in plsc if est_sous_séquence(s, y)}
+        if plsc:
+            return plsc
+
+
+# ********** Classes **********
+class TestArbreChemins(unittest.TestCase):
+    """ Comparaison de l'arbre des chemins avec une énumération directe
+    """
+
+    def cas(self):
+        """ Fournit des couples de séquences courtes et leur résolution
+        """
+        hasard = random.Random(2026)
+        couples = [('ABCBDAB', 'BDCABA'), ('', 'abc'), ('aaaa', 'aaa'), ('abc', 'def')]
+        for _ in range(150):
+            couples.append(tuple("".join(hasard.choice('abc') for _ in range(hasard.randint(0, 7)))
+                                 for _ in range(2)))
+        for x, y in couples:
+            T = ResoPLSC()
+            longueur = T.calcule_tableau(x, y)
+            i, j = len(T.X) - 1, len(T.Y) - 1
+            T.chemins = T.backtracking_arbre(i, j, longueur)
+            yield x, y, T, chemins_référence(T, i, j, longueur)
+
+    def test_chemins(self):
+        for x, y, T, référence in self.cas():
+            arbre = T.chemins
+            self.assertEqual([arbre[k] for k in range(len(arbre))], référence, (x, y))
+            self.assertEqual(T.compte_chemins(len(x), len(y), T.tableau[-1][-1]),
+                             len(référence))
+            # Un nœud par début de chemin distinct
+            débuts = {tuple(chemin[:n]) for chemin in référence
+                      for n in range(1, len(chemin)+1)}
+            self.assertEqual(len(arbre.parents), len(débuts))
+
+    def test_chaînes(self):
+        for x, y, T, référence in self.cas():
+            chaînes = [T.chemin_vers_chaîne(k) for k in range(len(référence))]
+            self.assertEqual(chaînes, [T.chaîne_du_chemin(chemin) for chemin in référence])
+            self.assertEqual(set(chaînes), plsc_force_brute(x, y), (x, y))
+            self.assertEqual(T.chemin_vers_chaîne(len(référence)), "")
+
+    def test_différence(self):
+        for x, y, T, référence in self.cas():
+            for ancien, nouveau in itertools.product(range(len(référence)), repeat=2):
+                chemin_ancien, chemin_nouveau = référence[ancien], référence[nouveau]
+                commun = 0
+                while (commun < len(chemin_ancien)
+                       and chemin_ancien[commun] == chemin_nouveau[commun]):
+                    commun += 1
+                self.assertEqual(T.chemins.différence(ancien, nouveau),
+                                 (chemin_ancien[commun:][::-1], chemin_nouveau[commun:][::-1]))
+                if ancien == nouveau:
+                    self.assertEqual(T.chemins.différence(ancien, nouveau), ([], []))
+
+
+class TestPLSCGlissante(unittest.TestCase):
+    """ Comparaison du peignage des algues avec le tableau de chaque fenêtre
+    """
+
+    def setUp(self):
+        self.hasard = random.Random(2026)
+
+    def séquence(self, longueur: int, alphabet='abc') -> str:
+        return "".join(self.hasard.choice(alphabet) for _ in range(longueur))
+
+    def test_ajoute_retire(self):
+        # Ajouts et retraits au hasard, sans largeur fixée
+        for _ in range(300):
+            x = self.séquence(self.hasard.randint(0, 6))
+            recherche = PLSCGlissante(x)
+            fenêtre = []
+            for _ in range(30):
+                if fenêtre and self.hasard.random() < 0.4:
+                    fenêtre.pop(0)
+                    longueur = recherche.retire()
+                else:
+                    symbole = self.hasard.choice('abcd')
+                    fenêtre.append(symbole)
+                    longueur = recherche.ajoute(symbole)
+                self.assertEqual(longueur, longueur_référence(x, fenêtre), (x, fenêtre))
+                self.assertEqual(list(recherche.fenêtre), fenêtre)
+
+    def test_largeurs(self):
+        for largeur in (1, 2, 3, 5, 8):
+            for _ in range(100):
+                x = self.séquence(self.hasard.randint(0, 6))
+                flux = self.séquence(self.hasard.randint(0, 20), 'abcd')
+                résultats = list(plsc_glissante(x, flux, largeur, avec_plsc=True))
+                self.assertEqual(len(résultats), len(flux))
+                for fin, (longueur, plsc) in enumerate(résultats, 1):
+                    fenêtre = flux[max(0, fin-largeur):fin]
+                    self.assertEqual(longueur, longueur_référence(x, fenêtre),
+                                     (x, fenêtre))
+                    self.assertEqual(len(plsc), longueur)
+                    self.assertTrue(est_sous_séquence(plsc, x), (plsc, x))
+                    self.assertTrue(est_sous_séquence(plsc, fenêtre), (plsc, fenêtre))
+                self.assertEqual([longueur for longueur, _ in résultats],
+                                 list(plsc_glissante(x, flux, largeur)))
+
+    def test_symboles_non_chaîne(self):
+        # X liste de symboles: la PLSC est une liste
+        recherche = PLSCGlissante([1, 2, 3], 3)
+        for symbole in (3, 1, 9, 3):
+            recherche.ajoute(symbole)
+        self.assertEqual((recherche.longueur(), recherche.plsc()), (2, [1, 3]))
+
+    def test_fenêtre_vide(self):
+        recherche = PLSCGlissante('abc')
+        self.assertEqual((recherche.longueur(), recherche.plsc()), (0, ''))
+        with self.assertRaises(ValueError):
+            recherche.retire()
+        recherche.ajoute('a')
+        self.assertEqual(recherche.retire(), 0)
+        with self.assertRaises(ValueError):
+            recherche.retire()
+
+    def test_largeur_invalide(self):
+        for largeur in (0, -1):
+            with self.assertRaises(ValueError):
+                PLSCGlissante('abc', largeur)
+            with self.assertRaises(ValueError):
+                next(plsc_glissante('abc', 'abc', largeur))
+
+
+# ********** Corps du programme **********
+if __name__ == '__main__':
+    unittest.main()